@@ -1,15 +1,25 @@
 import streamlit as st
 from dotenv import load_dotenv
 import tempfile
-import pandas as pd
+import shutil
+from concurrent.futures import wait
+import asyncio
+import logging
+import diskcache
 import os
 # Import our backend logic from main.py
 from main import (
     load_ai_model,
     get_ai_triage_analysis,
-    transcribe_audio,
-    find_nearby_places_google,
-    TriageResponse  # Import the class for type checking
+    load_speech_model,
+    load_audio_16k,
+    transcribe_audio_async,
+    find_nearby_places_many,
+    prefetch_nearby_places,
+    EMERGENCY_QUERY,
+    PLACES_TIMEOUT_SECONDS,
+    TriageResponse,  # Import the class for type checking
+    CONTEXT_CACHE_TTL_SECONDS
 )
 
 # Import location components
@@ -23,23 +33,32 @@ st.set_page_config(
 # Load environment variables from .env file
 load_dotenv()
 
+# Geocoding results rarely change, and Nominatim allows only 1 req/s, so repeat cities are served
+# from memory, then disk, before going to the network.
+_geocode_cache = diskcache.Cache(".geocode_cache")
+
+@st.cache_resource
+def _geolocator():
+    return Nominatim(user_agent="voicedoc_app")
+
+@_geocode_cache.memoize(expire=86400)
+def _geocode(city):
+    location = _geolocator().geocode(city)
+    return (location.latitude, location.longitude) if location else None
+
+@st.cache_data(ttl=86400)
+def geocode_city(city: str):
+    return _geocode(city)
+
 # Initialize session state
 if "analysis_result" not in st.session_state:
     st.session_state.analysis_result = None
 if "user_location" not in st.session_state:
     st.session_state.user_location = None
 
-# --- Load Models (this is cached by Streamlit) ---
-try:
-    llm, parser = load_ai_model()
-except ValueError as e:
-    st.error(str(e), icon="🚨")
-    st.stop()
-
-
 # --- 2. STREAMLIT USER INTERFACE ---
 st.title("🏥 VoiceDoc – LIVE AI Health Assistant")
-st.caption("Powered by Gemini 1.5 Flash & Google Maps Platform")
+st.caption("Powered by Gemini 2.5 Flash & Google Maps Platform")
 
 # Sidebar
 st.sidebar.title("Configuration")
@@ -54,11 +73,10 @@ with st.sidebar:
     if st.button("Find Location from City"):
         with st.spinner("Finding coordinates..."):
             try:
-                geolocator = Nominatim(user_agent="voicedoc_app")
-                location = geolocator.geocode(manual_city)
+                location = geocode_city(manual_city.strip().lower())
                 if location:
-                    st.session_state.user_location = (location.latitude, location.longitude)
-                    st.success(f"Location set to {manual_city}: ({location.latitude:.4f}, {location.longitude:.4f})")
+                    st.session_state.user_location = location
+                    st.success(f"Location set to {manual_city}: ({location[0]:.4f}, {location[1]:.4f})")
                 else: st.error("Could not find this city.")
             except Exception as e: st.error(f"Geocoding error: {e}")
     st.divider()
@@ -73,23 +91,64 @@ if not st.session_state.user_location:
     st.warning("Please set your location in the sidebar to enable analysis.", icon="📍")
 uploaded_file = st.file_uploader("Upload an audio recording:", type=["wav", "mp3", "m4a"], label_visibility="collapsed")
 
+# --- Load Models (this is cached by Streamlit) ---
+# Loaded after the UI above is drawn so the page paints before the heavy AI dependencies import.
+# Reload a few minutes before Gemini's prompt cache expires so the model never points at a dead cache.
+@st.cache_resource(ttl=CONTEXT_CACHE_TTL_SECONDS - 300)
+def load_cached_ai_model():
+    return load_ai_model()
+
+@st.cache_resource
+def load_cached_speech_model():
+    return load_speech_model()
+
+@st.cache_resource
+def load_triage_cache():
+    # The cache only saves Gemini calls, so if it can't load (model download, corrupt files) run without it.
+    try:
+        from triage_cache import TriageCache
+        return TriageCache()
+    except Exception:
+        logging.getLogger(__name__).exception("Could not load the triage cache; continuing without it.")
+        return None
+
+try:
+    chain = load_cached_ai_model()
+    speech_model = load_cached_speech_model()
+    triage_cache = load_triage_cache()
+except ValueError as e:
+    st.error(str(e), icon="🚨")
+    st.stop()
+
 if uploaded_file:
     st.audio(uploaded_file)
     if st.button("Analyze Symptoms", type="primary", use_container_width=True, disabled=(st.session_state.user_location is None)):
         st.session_state.analysis_result = None
+        # Nearby hospitals depend only on location, so fetch them speculatively while the AI works.
+        emergency_prefetch = prefetch_nearby_places(*st.session_state.user_location, EMERGENCY_QUERY)
         with st.status(f"Analyzing in {selected_language_name}...", expanded=True) as status:
             with tempfile.NamedTemporaryFile(delete=False, suffix='.wav') as tmp_file:
-                tmp_file.write(uploaded_file.getvalue()); temp_audio_path = tmp_file.name
+                # Copy in 1 MB chunks rather than materializing the whole upload as one bytes object.
+                uploaded_file.seek(0)
+                shutil.copyfileobj(uploaded_file, tmp_file, 1 << 20); temp_audio_path = tmp_file.name
             
             status.update(label="🎙️ Transcribing audio...")
-            transcribed_text = transcribe_audio(temp_audio_path, language_code)
+            audio = load_audio_16k(temp_audio_path)
             os.remove(temp_audio_path)
+            if isinstance(audio, str):
+                transcribed_text = audio
+            else:
+                transcribed_text = asyncio.run(transcribe_audio_async(speech_model, audio, language_code))
             
             if "Error:" in transcribed_text:
                 status.update(label="Transcription Failed.", state="error", expanded=True); st.error(transcribed_text, icon="🚫")
             else:
                 status.update(label="🧠 Analyzing symptoms with Gemini Flash...")
-                analysis_result = get_ai_triage_analysis(llm, parser, transcribed_text, selected_language_name)
+                live_output = st.empty()
+                analysis_result = asyncio.run(get_ai_triage_analysis(
+                    chain, transcribed_text, selected_language_name, cache=triage_cache, on_partial=live_output.json
+                ))
+                live_output.empty()
                 
                 if isinstance(analysis_result, TriageResponse):
                     st.session_state.analysis_result = analysis_result
@@ -98,21 +157,39 @@ if uploaded_file:
                     st.session_state.analysis_result = None
                     status.update(label="AI Analysis Failed.", state="error", expanded=True); st.error(str(analysis_result), icon="🤖")
 
+        analysis_result = st.session_state.analysis_result
+        if isinstance(analysis_result, TriageResponse) and analysis_result.urgency == "Emergency":
+            # Usually already finished, so the results view reads it from the cache. If it stalls, stop waiting
+            # and let the results view run its own lookup.
+            wait([emergency_prefetch], timeout=PLACES_TIMEOUT_SECONDS)
+        else:
+            emergency_prefetch.cancel()
+
 # --- Display Results ---
+PLACES_COLUMN_CONFIG = {
+    "Rating": st.column_config.NumberColumn(format="%.1f"),
+    "Distance (km)": st.column_config.NumberColumn(format="%.1f"),
+}
 if isinstance(st.session_state.analysis_result, TriageResponse):
     result = st.session_state.analysis_result
+    import pandas as pd
     user_lat, user_lon = st.session_state.user_location
     st.subheader("AI Triage & Guidance Report", divider="blue")
 
-    if result.urgency == "Emergency":
+    # Hospital and specialist searches run concurrently instead of back to back.
+    is_emergency = result.urgency == "Emergency"
+    queries = [EMERGENCY_QUERY, result.suggested_specialty] if is_emergency else [result.suggested_specialty]
+    with st.spinner("Searching nearby services with Google Maps..."):
+        *emergency_results, doctors_df = asyncio.run(find_nearby_places_many(user_lat, user_lon, queries))
+
+    if is_emergency:
         st.error(f"**URGENCY: EMERGENCY**\n\nSeek immediate medical attention.", icon="🚨")
-        with st.spinner("Searching for nearest hospitals with Google Maps..."):
-            emergency_df = find_nearby_places_google(user_lat, user_lon, "hospital emergency")
-            st.subheader("Nearest Emergency Services (from Google Maps)")
-            if isinstance(emergency_df, pd.DataFrame) and not emergency_df.empty:
-                st.table(emergency_df.style.format({'Rating':'{:.1f}', 'Distance (km)': '{:.1f}'}))
-            else:
-                st.warning("Could not find nearby emergency services.")
+        emergency_df = emergency_results[0]
+        st.subheader("Nearest Emergency Services (from Google Maps)")
+        if isinstance(emergency_df, pd.DataFrame) and not emergency_df.empty:
+            st.dataframe(emergency_df, column_config=PLACES_COLUMN_CONFIG, hide_index=True)
+        else:
+            st.warning("Could not find nearby emergency services.")
     
     tab1, tab2, tab3 = st.tabs(["**📋 Triage Summary**", "**❤️ Self-Care & Tests**", "**🧑‍⚕️ Find a Doctor**"])
     with tab1:
@@ -138,13 +215,11 @@ if isinstance(st.session_state.analysis_result, TriageResponse):
             
     with tab3:
         st.markdown(f"The AI recommends consulting a **{result.suggested_specialty}**.")
-        with st.spinner(f"Finding nearest {result.suggested_specialty}s with Google Maps..."):
-            doctors_df = find_nearby_places_google(user_lat, user_lon, result.suggested_specialty)
-            st.subheader(f"Nearest {result.suggested_specialty}s (from Google Maps)")
-            if isinstance(doctors_df, pd.DataFrame) and not doctors_df.empty:
-                st.table(doctors_df.style.format({'Rating':'{:.1f}', 'Distance (km)': '{:.1f}'}))
-            else:
-                st.warning(f"Could not find any nearby doctors for the specialty '{result.suggested_specialty}'.")
+        st.subheader(f"Nearest {result.suggested_specialty}s (from Google Maps)")
+        if isinstance(doctors_df, pd.DataFrame) and not doctors_df.empty:
+            st.dataframe(doctors_df, column_config=PLACES_COLUMN_CONFIG, hide_index=True)
+        else:
+            st.warning(f"Could not find any nearby doctors for the specialty '{result.suggested_specialty}'.")
 
 st.divider()
 st.warning("**Disclaimer:** This is a prototype and not a substitute for professional medical advice.", icon="⚠️")
\ No newline at end of file
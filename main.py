@@ -1,103 +1,362 @@
 import os
-import speech_recognition as sr
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain.prompts import PromptTemplate
-from langchain.output_parsers import PydanticOutputParser
+import re
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from pydantic import BaseModel, Field
-from typing import List, Optional
-import pandas as pd
-import requests
-from math import radians, cos, sin, asin, sqrt
+from typing import Optional
+import numpy as np
+import diskcache
+import orjson
+# Heavy dependencies (LangChain, Gemini SDK, Whisper, pandas, HTTP clients) are imported inside the
+# functions that use them so Streamlit can paint the UI before they load.
 
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 GOOGLE_MAPS_API_KEY = os.getenv("GOOGLE_MAPS_API_KEY")
 
+LLM_MODEL = "gemini-2.5-flash"
+WHISPER_MODEL_SIZE = "small"
+# int8 weights keep the CPU model cache-resident; override (e.g. "int8_float16") if it benchmarks faster on the host.
+WHISPER_CPU_COMPUTE_TYPE = os.getenv("WHISPER_COMPUTE_TYPE", "int8")
+PLACES_CACHE_TTL_SECONDS = 86400
+# Matches httpx's default, so the sync and async Places paths give up on a stalled connection alike.
+PLACES_TIMEOUT_SECONDS = 5
+EMERGENCY_QUERY = "hospital emergency"
+# Lifetime of the server-side prompt cache; callers holding the model should refresh it before this expires.
+CONTEXT_CACHE_TTL_SECONDS = 3600
+# Smallest prompt Gemini 2.5 Flash accepts for explicit context caching.
+MIN_CACHE_TOKENS = 1024
+
+logger = logging.getLogger(__name__)
+
+# Static preamble: cached by Gemini when possible, so it must not contain any per-patient placeholders.
+SYSTEM_PROMPT = """
+You are 'VoiceDoc', a precise medical triage AI. You will receive a patient's statement together with the language it was spoken in. Analyze it and output a valid JSON object in English.
+**CRITICAL INSTRUCTION: Your output MUST be a single, valid JSON object. Do not add any text before or after it.**
+{format_instructions}
+
+**Example 1**
+Patient's statement (English (India)): "I have had a high fever of 103 degrees since yesterday and my whole body is aching."
+Output: {{"urgency": "Urgent", "possible_causes": ["Viral fever", "Influenza", "Dengue"], "suggested_specialty": "General Physician", "self_care_tips": ["Drink plenty of fluids", "Rest and monitor your temperature every few hours", "Take paracetamol as directed on the label"], "recommended_tests": ["Complete Blood Count (CBC)", "Dengue NS1 antigen test"], "explanation": "A fever of 103°F with body aches suggests an infection that should be evaluated by a doctor within a day, especially to rule out dengue."}}
+
+**Example 2**
+Patient's statement (Hindi (हिन्दी)): "मेरे सीने में तेज़ दर्द है जो बाएं हाथ तक जा रहा है और पसीना आ रहा है।"
+Output: {{"urgency": "Emergency", "possible_causes": ["Heart attack", "Unstable angina"], "suggested_specialty": "Cardiologist", "self_care_tips": null, "recommended_tests": ["Electrocardiogram (ECG)", "Cardiac troponin test"], "explanation": "Severe chest pain spreading to the left arm with sweating are warning signs of a heart attack and need immediate emergency care."}}
+
+**Example 3**
+Patient's statement (English (India)): "I have had a runny nose, sneezing and a mild sore throat for two days. No fever."
+Output: {{"urgency": "Routine", "possible_causes": ["Common cold", "Allergic rhinitis"], "suggested_specialty": "General Physician", "self_care_tips": ["Drink warm fluids and rest", "Gargle with warm salt water for the sore throat", "Use steam inhalation to ease congestion"], "recommended_tests": null, "explanation": "Mild cold symptoms without fever usually settle on their own within a week; see a doctor if a fever develops or symptoms last beyond ten days."}}
+
+**Example 4**
+Patient's statement (Hindi (हिन्दी)): "नमस्ते, पिछले एक हफ्ते से मुझे पेशाब करते समय जलन हो रही है और कल से हल्का बुखार भी है।"
+Output: {{"urgency": "Urgent", "possible_causes": ["Urinary tract infection", "Kidney infection"], "suggested_specialty": "Urologist", "self_care_tips": ["Drink plenty of water", "Avoid holding in urine", "Avoid caffeine and alcohol until you are seen"], "recommended_tests": ["Urine routine and microscopy", "Urine culture", "Complete Blood Count (CBC)"], "explanation": "A week of burning urination with a new fever suggests a urinary infection that may be spreading and should be treated by a doctor within a day or two."}}
+
+**Example 5**
+Patient's statement (English (India)): "My father suddenly cannot move his right arm, his face is drooping on one side and he is not able to speak properly."
+Output: {{"urgency": "Emergency", "possible_causes": ["Stroke", "Transient ischemic attack"], "suggested_specialty": "Neurologist", "self_care_tips": null, "recommended_tests": ["CT scan of the brain", "MRI of the brain", "Blood sugar test"], "explanation": "Sudden one-sided weakness, facial drooping and slurred speech are classic stroke signs; treatment works best within the first few hours, so he needs emergency care now."}}
+
+**Example 6**
+Patient's statement (Hindi (हिन्दी)): "खाना खाने के बाद पेट में जलन होती है और खट्टी डकारें आती हैं, यह कई महीनों से है।"
+Output: {{"urgency": "Routine", "possible_causes": ["Acid reflux (GERD)", "Gastritis"], "suggested_specialty": "Gastroenterologist", "self_care_tips": ["Eat smaller meals and avoid lying down for two hours after eating", "Cut down on spicy, oily food, tea and coffee", "Raise the head end of the bed"], "recommended_tests": ["Upper GI endoscopy", "H. pylori test"], "explanation": "Long-standing burning after meals with sour belching is typical of acid reflux; it is not dangerous right now but should be reviewed at a planned visit."}}
+
+**Example 7**
+Patient's statement (English (India)): "I twisted my ankle while playing cricket this morning. It is swollen and painful but I can still walk a little."
+Output: {{"urgency": "Urgent", "possible_causes": ["Ankle sprain", "Ligament tear", "Hairline fracture"], "suggested_specialty": "Orthopedic Surgeon", "self_care_tips": ["Rest the ankle and avoid putting full weight on it", "Apply an ice pack for 15-20 minutes every few hours", "Keep the foot raised above heart level"], "recommended_tests": ["X-ray of the ankle"], "explanation": "A swollen, painful ankle after a twist is most often a sprain, but an X-ray within a day or two is needed to rule out a fracture."}}
+
+**Example 8**
+Patient's statement (English (India)): "For the last few weeks I feel very low, I cannot sleep, and sometimes I think it would be better if I were not alive."
+Output: {{"urgency": "Emergency", "possible_causes": ["Major depression", "Suicidal ideation"], "suggested_specialty": "Psychiatrist", "self_care_tips": null, "recommended_tests": null, "explanation": "Thoughts of not wanting to be alive need immediate help; please contact emergency services or a crisis helpline now and do not stay alone."}}
+
+**Example 9**
+Patient's statement (Hindi (हिन्दी)): "मेरे बच्चे को दो दिन से खांसी और नाक बह रही है, बुखार नहीं है और वह ठीक से खा-पी रहा है।"
+Output: {{"urgency": "Routine", "possible_causes": ["Common cold", "Viral upper respiratory infection"], "suggested_specialty": "Pediatrician", "self_care_tips": ["Give plenty of fluids", "Use saline nose drops to clear the nose", "Let the child rest and watch for fever or fast breathing"], "recommended_tests": null, "explanation": "A cough and runny nose without fever in a child who is eating and drinking normally is usually a mild viral infection; see a pediatrician if fever or breathing difficulty appears."}}
+
+**Example 10**
+Patient's statement (English (India)): "I get a throbbing headache on one side with nausea every few weeks, and bright light makes it worse. It lasts most of the day."
+Output: {{"urgency": "Routine", "possible_causes": ["Migraine", "Tension-type headache"], "suggested_specialty": "Neurologist", "self_care_tips": ["Rest in a dark, quiet room during an attack", "Keep a headache diary to find triggers", "Maintain regular sleep and meal times"], "recommended_tests": null, "explanation": "Recurring one-sided throbbing headaches with nausea and light sensitivity are typical of migraine; a planned visit can confirm it and discuss treatment."}}
+
+**Example 11**
+Patient's statement (English (India)): "Since last night I have had loose motions about eight times and vomiting. I feel very weak and dizzy when I stand up."
+Output: {{"urgency": "Urgent", "possible_causes": ["Acute gastroenteritis", "Food poisoning", "Dehydration"], "suggested_specialty": "General Physician", "self_care_tips": ["Sip oral rehydration solution (ORS) frequently", "Eat light food such as rice, banana or curd once vomiting settles", "Rest and avoid standing up suddenly"], "recommended_tests": ["Serum electrolytes", "Stool routine examination"], "explanation": "Repeated diarrhoea and vomiting with dizziness on standing suggest dehydration, which needs a doctor's assessment within a day."}}
+"""
+PATIENT_PROMPT = """
+**Patient's statement ({language}):** "{patient_text}"
+"""
+
 class TriageResponse(BaseModel):
     urgency: str = Field(description="Classify urgency: 'Emergency', 'Urgent', or 'Routine'.")
-    possible_causes: List[str] = Field(description="A list of 2-3 potential, general causes.")
+    possible_causes: list[str] = Field(description="A list of 2-3 potential, general causes.")
     suggested_specialty: str = Field(description="The title of the medical specialist to consult (e.g., 'Cardiologist', 'Neurologist', 'General Physician').")
-    self_care_tips: Optional[List[str]] = Field(description="Safe, actionable self-care tips for non-emergencies.")
-    recommended_tests: Optional[List[str]] = Field(description="Common diagnostic tests a doctor might recommend.")
+    self_care_tips: Optional[list[str]] = Field(default=None, description="Safe, actionable self-care tips for non-emergencies.")
+    recommended_tests: Optional[list[str]] = Field(default=None, description="Common diagnostic tests a doctor might recommend.")
     explanation: str = Field(description="A brief, clear explanation for the overall assessment.")
 
+@functools.lru_cache(maxsize=None)
+def get_format_instructions() -> str:
+    """Returns the JSON schema instructions for TriageResponse, rendered once since they only depend on the class."""
+    from langchain_core.output_parsers import JsonOutputParser
+
+    return JsonOutputParser(pydantic_object=TriageResponse).get_format_instructions()
+
+# A fenced ```json block anywhere in the text, or else the outermost {...} span.
+_JSON_BLOCK_RE = re.compile(r"```(?:json)?\s*(.*?)\s*```|(\{.*\})", re.DOTALL)
+
+def _extract_json(text: str) -> str:
+    """Pulls the JSON object out of the model's reply, ignoring code fences or any text around it."""
+    match = _JSON_BLOCK_RE.search(text)
+    if match is None:
+        return text.strip()
+    return match.group(1) if match.group(1) is not None else match.group(2)
+
+def parse_triage_response(text: str) -> TriageResponse:
+    """Parses and validates the model's JSON in one pass with pydantic-core's native JSON parser."""
+    return TriageResponse.model_validate_json(_extract_json(text))
+
+def create_prompt_cache(system_instruction: str) -> Optional[str]:
+    """Caches the static system prompt on Gemini's side and returns the cache name, or None if caching is unavailable."""
+    from google import genai
+    from google.genai import types
+
+    client = genai.Client(api_key=GOOGLE_API_KEY)
+    try:
+        token_count = client.models.count_tokens(model=LLM_MODEL, contents=system_instruction).total_tokens
+        if token_count < MIN_CACHE_TOKENS:
+            logger.warning(
+                "System prompt is %d tokens, below Gemini's %d-token caching minimum; sending it inline.",
+                token_count, MIN_CACHE_TOKENS,
+            )
+            return None
+        cache = client.caches.create(
+            model=LLM_MODEL,
+            config=types.CreateCachedContentConfig(
+                system_instruction=system_instruction,
+                ttl=f"{CONTEXT_CACHE_TTL_SECONDS}s",
+            ),
+        )
+    except Exception:
+        # e.g. an invalid key or exhausted quota; the app still works with the prompt sent inline.
+        logger.exception("Could not create the Gemini prompt cache; sending the system prompt inline.")
+        return None
+    return cache.name
+
 def load_ai_model():
-    """Loads and returns the initialized Gemini model and the response parser."""
+    """Builds and returns the triage chain (prompt and Gemini model); its text output goes to parse_triage_response."""
     if not GOOGLE_API_KEY:
         raise ValueError("GOOGLE_API_KEY for Gemini not found!")
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    from langchain_core.prompts import PromptTemplate
     
-    llm = ChatGoogleGenerativeAI(model="gemini-1.5-flash-latest", temperature=0.1)
-    parser = PydanticOutputParser(pydantic_object=TriageResponse)
-    return llm, parser
-
-def get_ai_triage_analysis(llm, parser, patient_text: str, language: str):
-    """Gets the structured triage analysis from the LLM."""
-    prompt_template = """
-    You are 'VoiceDoc', a precise medical triage AI. Analyze the patient's statement in {language} and output a valid JSON object in English.
-    **CRITICAL INSTRUCTION: Your output MUST be a single, valid JSON object. Do not add any text before or after it.**
-    {format_instructions}
-    **Patient's statement ({language}):** "{patient_text}"
-    """
+    format_instructions = get_format_instructions()
+    cache_name = create_prompt_cache(SYSTEM_PROMPT.format(format_instructions=format_instructions))
+    llm = ChatGoogleGenerativeAI(model=LLM_MODEL, temperature=0.1, cached_content=cache_name)
+    # When the preamble is cached server-side only the patient's statement is sent.
     prompt = PromptTemplate(
-        template=prompt_template,
+        template=PATIENT_PROMPT if cache_name else SYSTEM_PROMPT + PATIENT_PROMPT,
         input_variables=["patient_text", "language"],
-        partial_variables={"format_instructions": parser.get_format_instructions()},
+        partial_variables={"format_instructions": format_instructions},
     )
-    chain = prompt | llm | parser
+    return prompt | llm
+
+async def get_ai_triage_analysis(chain, patient_text: str, language: str, cache=None, on_partial=None):
+    """Streams the structured triage analysis from the LLM, passing each partial JSON object to on_partial."""
+    from langchain_core.utils.json import parse_json_markdown
+
+    # The semantic cache is only an optimization: if it fails, treat it as a miss and go to Gemini.
+    cache_key = None
+    if cache is not None:
+        try:
+            cached, cache_key = cache.lookup(patient_text, language)
+            if cached is not None:
+                return cached
+        except Exception:
+            logger.exception("Triage cache lookup failed; querying Gemini directly.")
+
     try:
-        return chain.invoke({"patient_text": patient_text, "language": language})
+        text = ""
+        async for chunk in chain.astream({"patient_text": patient_text, "language": language}):
+            text += chunk.content
+            if on_partial is not None:
+                try:
+                    partial = parse_json_markdown(text)
+                except ValueError:
+                    continue  # not enough of the object has arrived yet
+                if partial is not None:
+                    on_partial(partial)
+        result = parse_triage_response(text)
     except Exception as e:
         return f"Error processing AI response: {e}"
 
-def transcribe_audio(audio_file_path: str, language_code: str) -> str:
-    """Transcribes an audio file using the free Google Web Speech API."""
-    recognizer = sr.Recognizer()
+    if cache_key is not None:
+        try:
+            cache.add(cache_key, result)
+        except Exception:
+            logger.exception("Could not store the triage result in the cache.")
+    return result
+
+def load_speech_model():
+    """Loads the local faster-whisper model, on the GPU when one is available, behind a batching queue."""
+    import ctranslate2
+    from faster_whisper import WhisperModel
+    from transcription_queue import TranscriptionQueue
+
+    if ctranslate2.get_cuda_device_count() > 0:
+        model = WhisperModel(WHISPER_MODEL_SIZE, device="cuda", compute_type="int8_float16")
+    else:
+        model = WhisperModel(
+            WHISPER_MODEL_SIZE, device="cpu", compute_type=WHISPER_CPU_COMPUTE_TYPE, cpu_threads=os.cpu_count()
+        )
+    return TranscriptionQueue(model)
+
+def load_audio_16k(audio_file_path: str):
+    """Decodes an audio file once to 16 kHz mono int16 PCM, Whisper's native input, as a float32 waveform."""
+    from pydub import AudioSegment
+
+    try:
+        segment = AudioSegment.from_file(audio_file_path).set_frame_rate(16000).set_channels(1).set_sample_width(2)
+    except Exception as e:
+        return f"Error: Could not decode the audio file: {e}"
+    return np.frombuffer(segment.raw_data, dtype=np.int16).astype(np.float32) / 32768.0
+
+def transcribe_audio(transcriber, audio, language_code: str) -> str:
+    """Transcribes an audio file or 16 kHz waveform locally with faster-whisper."""
     try:
-        with sr.AudioFile(audio_file_path) as source:
-            audio_data = recognizer.record(source)
-            return recognizer.recognize_google(audio_data, language=language_code)
-    except sr.UnknownValueError:
+        # Whisper takes bare ISO-639-1 codes ('hi'), not locales ('hi-IN').
+        text = transcriber.submit(audio, language_code[:2]).result()
+    except Exception as e:
+        return f"Error: Could not process the audio file: {e}"
+    if not text:
         return "Error: Could not understand the audio."
-    except sr.RequestError:
-        return "Error: API request failed. Check internet."
+    return text
+
+async def transcribe_audio_async(transcriber, audio, language_code: str) -> str:
+    """Runs transcribe_audio in a worker thread so the caller's event loop is not blocked."""
+    return await asyncio.to_thread(transcribe_audio, transcriber, audio, language_code)
+
+PLACES_API_URL = "https://places.googleapis.com/v1/places:searchText"
+# Only request the fields we display to keep responses small. Asking for rating bills the call at the
+# Text Search Enterprise tier rather than Essentials/Pro.
+PLACES_FIELD_MASK = "places.displayName,places.shortFormattedAddress,places.rating,places.location"
+
+_places_cache = diskcache.Cache(".places_cache")
+_prefetch_executor = ThreadPoolExecutor(max_workers=4)
+
+@functools.lru_cache(maxsize=None)
+def _get_session():
+    """Returns the shared session that keeps TLS connections to Google Maps alive between searches."""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=16))
+    return session
+
+def _normalize_search(latitude, longitude, query, radius):
+    """Rounds the location to ~100 m and normalizes the query so nearby repeat searches share a cache entry."""
+    return (round(latitude, 3), round(longitude, 3), query.strip().lower(), radius)
+
+def _places_request(search):
+    """Builds the headers and body of a Places API (New) text search around the given location."""
+    latitude, longitude, query, radius = search
+    headers = {
+        'X-Goog-Api-Key': GOOGLE_MAPS_API_KEY,
+        'X-Goog-FieldMask': PLACES_FIELD_MASK
+    }
+    body = {
+        'textQuery': query,
+        'locationBias': {'circle': {'center': {'latitude': latitude, 'longitude': longitude}, 'radius': float(radius)}},
+        # Nearest first, so the results we keep after the radius filter are the closest ones, not the most relevant.
+        'rankPreference': 'DISTANCE'
+    }
+    return {'headers': headers, 'json': body}
+
+def _store_places(search, response):
+    """Parses a Places API response and caches the trimmed results under the normalized search."""
+    # Errors come back as HTTP status codes, so failed lookups raise here and are never cached.
+    response.raise_for_status()
+    data = orjson.loads(response.content)
+
+    places = []
+    for place in data.get('places') or []:
+        loc = place.get('location', {})
+        places.append({
+            "Name": place.get('displayName', {}).get('text', 'N/A'),
+            "Address": place.get('shortFormattedAddress', 'N/A'),
+            # Missing ratings stay empty so the column remains numeric.
+            "Rating": place.get('rating'),
+            "lat": loc.get('latitude', 0),
+            "lng": loc.get('longitude', 0)
+        })
+    _places_cache.set(search, places, expire=PLACES_CACHE_TTL_SECONDS)
+    return places
+
+def _places_dataframe(places, latitude, longitude, radius):
+    """Builds the results table, with distances measured from the user's exact location."""
+    import pandas as pd
+
+    if not places: return pd.DataFrame()
+
+    lats = np.fromiter((place['lat'] for place in places), dtype=float, count=len(places))
+    lngs = np.fromiter((place['lng'] for place in places), dtype=float, count=len(places))
+    # Haversine distance for all places at once
+    R = 6371
+    dLat, dLon = np.radians(lats - latitude), np.radians(lngs - longitude)
+    a = np.sin(dLat / 2) ** 2 + np.cos(np.radians(latitude)) * np.cos(np.radians(lats)) * np.sin(dLon / 2) ** 2
+    dist = 2 * R * np.arcsin(np.sqrt(a))
+
+    df = pd.DataFrame({
+        "Name": [place['Name'] for place in places],
+        "Address": [place['Address'] for place in places],
+        "Rating": [place['Rating'] for place in places],
+        "Distance (km)": dist
+    })
+    # Text Search only biases towards the circle, so enforce the radius the old Nearby Search applied.
+    return df[df['Distance (km)'] <= radius / 1000].sort_values('Distance (km)')
 
 def find_nearby_places_google(latitude, longitude, query, radius=10000):
     """Finds nearby places using the Google Maps Places API."""
     if not GOOGLE_MAPS_API_KEY:
         raise ValueError("GOOGLE_MAPS_API_KEY not found!")
-        
-    api_url = "https://maps.googleapis.com/maps/api/place/nearbysearch/json"
-    params = {
-        'location': f"{latitude},{longitude}",
-        'radius': radius,
-        'keyword': query,
-        'key': GOOGLE_MAPS_API_KEY
-    }
+    import requests
+
+    search = _normalize_search(latitude, longitude, query, radius)
     try:
-        response = requests.get(api_url, params=params)
-        response.raise_for_status()
-        data = response.json()
-        
-        places = []
-        if data.get('results'):
-            for place in data['results']:
-                loc = place.get('geometry', {}).get('location', {})
-                # Haversine distance calculation
-                R = 6371; lat1, lon1, lat2, lon2 = map(radians, [latitude, longitude, loc.get('lat', 0), loc.get('lng', 0)])
-                dLat, dLon = lat2 - lat1, lon2 - lon1
-                a = sin(dLat / 2) ** 2 + cos(lat1) * cos(lat2) * sin(dLon / 2) ** 2
-                dist = 2 * R * asin(sqrt(a))
-                
-                places.append({
-                    "Name": place.get('name', 'N/A'),
-                    "Address": place.get('vicinity', 'N/A'),
-                    "Rating": place.get('rating', 'N/A'),
-                    "Distance (km)": dist
-                })
-        
-        if not places: return pd.DataFrame()
-        return pd.DataFrame(places).sort_values('Distance (km)')
-        
+        places = _places_cache.get(search)
+        if places is None:
+            places = _store_places(search, _get_session().post(PLACES_API_URL, timeout=PLACES_TIMEOUT_SECONDS, **_places_request(search)))
+        return _places_dataframe(places, latitude, longitude, radius)
     except requests.exceptions.RequestException as e:
         return f"Error connecting to Google Maps API: {e}"
     except Exception as e:
-        return f"An error occurred while parsing Google Maps data: {e}"
\ No newline at end of file
+        return f"An error occurred while parsing Google Maps data: {e}"
+
+async def find_nearby_places_google_async(client, latitude, longitude, query, radius=10000):
+    """Async variant of find_nearby_places_google that issues its request through a shared httpx client."""
+    if not GOOGLE_MAPS_API_KEY:
+        raise ValueError("GOOGLE_MAPS_API_KEY not found!")
+    import httpx
+
+    search = _normalize_search(latitude, longitude, query, radius)
+    try:
+        places = _places_cache.get(search)
+        if places is None:
+            places = _store_places(search, await client.post(PLACES_API_URL, timeout=PLACES_TIMEOUT_SECONDS, **_places_request(search)))
+        return _places_dataframe(places, latitude, longitude, radius)
+    except httpx.HTTPError as e:
+        return f"Error connecting to Google Maps API: {e}"
+    except Exception as e:
+        return f"An error occurred while parsing Google Maps data: {e}"
+
+async def find_nearby_places_many(latitude, longitude, queries):
+    """Runs several Places searches concurrently, multiplexed over one HTTP/2 connection."""
+    import httpx
+
+    # The client is bound to the running event loop, so it lives for one batch of searches.
+    async with httpx.AsyncClient(http2=True) as client:
+        return await asyncio.gather(
+            *(find_nearby_places_google_async(client, latitude, longitude, query) for query in queries)
+        )
+
+def prefetch_nearby_places(latitude, longitude, query):
+    """Starts a Places search in the background; once done, the next lookup for it is served from the cache."""
+    return _prefetch_executor.submit(find_nearby_places_google, latitude, longitude, query)
\ No newline at end of file
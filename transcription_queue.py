@@ -0,0 +1,113 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+import numpy as np
+from faster_whisper import BatchedInferencePipeline, decode_audio
+from faster_whisper.vad import VadOptions, collect_chunks, get_speech_timestamps
+
+MAX_BATCH_FILES = 8
+BATCH_WINDOW_SECONDS = 0.05
+DECODE_BATCH_SIZE = 16
+
+class TranscriptionQueue:
+    """Collects transcription requests from concurrent sessions and runs them through Whisper in batches."""
+
+    def __init__(self, model, max_batch_files: int = MAX_BATCH_FILES, window: float = BATCH_WINDOW_SECONDS):
+        self.pipeline = BatchedInferencePipeline(model)
+        self.sampling_rate = model.feature_extractor.sampling_rate
+        self.chunk_length = model.feature_extractor.chunk_length
+        self.max_batch_files = max_batch_files
+        self.window = window
+        self._queue = queue.Queue()
+        threading.Thread(target=self._run, name="transcription-queue", daemon=True).start()
+
+    def submit(self, audio, language: str) -> Future:
+        """Queues an audio file (or 16 kHz waveform) and returns a future resolving to its transcript."""
+        future = Future()
+        self._queue.put((audio, language, future))
+        return future
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch_files:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            # The decoder is primed with a single language, so only same-language requests share a pass.
+            by_language = {}
+            for item in batch:
+                by_language.setdefault(item[1], []).append(item)
+            for language, items in by_language.items():
+                self._transcribe_batch(language, items)
+
+    def _transcribe_batch(self, language: str, items):
+        audios, futures = [], []
+        for audio, _, future in items:
+            if not future.set_running_or_notify_cancel():
+                continue
+            # Decode individually so one unreadable upload only fails its own request.
+            try:
+                if not isinstance(audio, np.ndarray):
+                    audio = decode_audio(audio, sampling_rate=self.sampling_rate)
+            except Exception as e:
+                future.set_exception(e)
+                continue
+            audios.append(audio)
+            futures.append(future)
+        if not futures:
+            return
+
+        try:
+            texts = self._transcribe_concatenated(audios, language)
+        except Exception as e:
+            for future in futures:
+                future.set_exception(e)
+            return
+        for future, text in zip(futures, texts):
+            future.set_result(text)
+
+    def _transcribe_concatenated(self, audios: list[np.ndarray], language: str) -> list[str]:
+        """Lays the recordings' speech end to end and decodes all of their chunks in one batched pass."""
+        vad_options = VadOptions(max_speech_duration_s=self.chunk_length, min_silence_duration_ms=160)
+        bounds, clips, pieces, position = [], [], [], 0
+        for audio in audios:
+            start = position
+            # VAD runs per recording so no chunk straddles two patients.
+            speech = get_speech_timestamps(audio, vad_options)
+            if speech:
+                # Merge consecutive speech segments into windows of up to chunk_length, like faster-whisper's
+                # own batched path, so short phrases share a decoder window instead of each taking one.
+                chunks, _ = collect_chunks(audio, speech, sampling_rate=self.sampling_rate, max_duration=self.chunk_length)
+                for chunk in chunks:
+                    if len(chunk) == 0:
+                        continue
+                    clips.append({
+                        "start": position / self.sampling_rate,
+                        "end": (position + len(chunk)) / self.sampling_rate,
+                    })
+                    pieces.append(chunk)
+                    position += len(chunk)
+            bounds.append((start, position))
+        if not clips:
+            return ["" for _ in audios]
+
+        # Each chunk is padded to Whisper's 30 s window, so recordings of any length batch together.
+        segments, _ = self.pipeline.transcribe(
+            np.concatenate(pieces), language=language, clip_timestamps=clips, batch_size=DECODE_BATCH_SIZE
+        )
+        texts = [[] for _ in audios]
+        for segment in segments:
+            midpoint = (segment.start + segment.end) / 2 * self.sampling_rate
+            owner = next((i for i, (start, end) in enumerate(bounds) if start <= midpoint < end), None)
+            # Never attach text we can't place to some other patient's transcript.
+            if owner is not None:
+                texts[owner].append(segment.text.strip())
+        return [" ".join(parts).strip() for parts in texts]
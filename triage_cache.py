@@ -0,0 +1,95 @@
+import os
+import re
+import threading
+from typing import Optional
+
+import faiss
+import numpy as np
+import orjson
+from sentence_transformers import SentenceTransformer
+
+from main import TriageResponse
+
+# Multilingual so that Hindi and English descriptions of the same symptoms land close together.
+EMBEDDING_MODEL = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+# Paraphrase models score "chest pain" vs "no chest pain" well above 0.9, so only near-verbatim repeats qualify,
+# and even those must also pass the guard-word check below.
+SIMILARITY_THRESHOLD = 0.97
+SEARCH_CANDIDATES = 5
+
+# Words that flip or rescale a symptom ("no fever", "two weeks") while barely moving the embedding.
+_GUARD_WORDS = frozenset({
+    "no", "not", "never", "without", "none", "nothing", "nahi", "nahin", "na", "bina",
+    "नहीं", "नही", "ना", "न", "बिना",
+    "one", "two", "three", "four", "five", "six", "seven", "eight", "nine", "ten", "twenty",
+    "ek", "do", "teen", "char", "paanch", "das",
+    "एक", "दो", "तीन", "चार", "पांच", "पाँच", "छह", "सात", "आठ", "नौ", "दस", "बीस",
+    "minute", "minutes", "hour", "hours", "day", "days", "week", "weeks", "month", "months", "year", "years",
+    "मिनट", "घंटे", "घंटा", "दिन", "हफ्ते", "हफ्ता", "हफ़्ते", "हफ़्ता", "महीने", "महीना", "साल",
+})
+_TOKEN_RE = re.compile(r"[^\s.,!?;:।\"'()]+")
+
+def _normalize(patient_text: str) -> str:
+    return " ".join(patient_text.lower().split())
+
+def _guard_tokens(normalized: str) -> list[str]:
+    """Numbers, negations and durations in the statement; a cached hit must match these exactly."""
+    words = [word for word in _TOKEN_RE.findall(normalized) if word in _GUARD_WORDS]
+    return sorted(words + re.findall(r"\d+", normalized))
+
+class TriageCache:
+    """Semantic cache of triage results keyed on the language and embedding of the patient's statement."""
+
+    def __init__(self, cache_dir: str = ".triage_cache", threshold: float = SIMILARITY_THRESHOLD):
+        self.threshold = threshold
+        self.index_path = os.path.join(cache_dir, "index.faiss")
+        self.entries_path = os.path.join(cache_dir, "entries.json")
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self.encoder = SentenceTransformer(EMBEDDING_MODEL)
+        self._lock = threading.Lock()
+        if os.path.exists(self.index_path) and os.path.exists(self.entries_path):
+            self.index = faiss.read_index(self.index_path)
+            with open(self.entries_path, "rb") as f:
+                self.entries = orjson.loads(f.read())
+            # An interrupted save can leave the two files out of step; start over rather than serve wrong rows.
+            if self.index.ntotal != len(self.entries):
+                self._reset()
+        else:
+            self._reset()
+
+    def _reset(self):
+        # Inner product over L2-normalized vectors == cosine similarity.
+        self.index = faiss.IndexFlatIP(self.encoder.get_sentence_embedding_dimension())
+        self.entries = []
+
+    def lookup(self, patient_text: str, language: str) -> tuple[Optional[TriageResponse], tuple]:
+        """Returns the cached response for a near-identical statement (or None) and the key to add() a fresh one under."""
+        normalized = _normalize(patient_text)
+        embedding = self.encoder.encode([normalized], normalize_embeddings=True).astype(np.float32)
+        key = (embedding, language, normalized)
+        guard = _guard_tokens(normalized)
+        with self._lock:
+            if self.index.ntotal == 0:
+                return None, key
+            scores, ids = self.index.search(embedding, min(SEARCH_CANDIDATES, self.index.ntotal))
+            for score, idx in zip(scores[0], ids[0]):
+                if score < self.threshold:
+                    break
+                entry = self.entries[idx]
+                if entry["language"] == language and _guard_tokens(entry["text"]) == guard:
+                    return TriageResponse.model_validate_json(entry["response"]), key
+        return None, key
+
+    def add(self, key: tuple, response: TriageResponse) -> None:
+        """Stores a fresh response under the key returned by lookup() and persists the cache."""
+        embedding, language, normalized = key
+        with self._lock:
+            self.index.add(embedding)
+            self.entries.append({"language": language, "text": normalized, "response": response.model_dump_json()})
+            # Write to temp files and swap them in so a crash never leaves a half-written file behind.
+            faiss.write_index(self.index, self.index_path + ".tmp")
+            with open(self.entries_path + ".tmp", "wb") as f:
+                f.write(orjson.dumps(self.entries))
+            os.replace(self.index_path + ".tmp", self.index_path)
+            os.replace(self.entries_path + ".tmp", self.entries_path)